@@ -5,6 +5,7 @@ import sys
 import yaml
 
 from pg_db_tools.md_renderer import render_md
+from pg_db_tools.pg_types import YAML_LOADER
 
 
 def setup_command_parser(subparsers):
@@ -33,7 +34,7 @@ def dot_command(args):
     else:
         out_file = args.output_file
 
-    data = yaml.load(args.infile, Loader=yaml.SafeLoader)
+    data = yaml.load(args.infile, Loader=YAML_LOADER)
 
     rendered_chunks = render_md(data)
 
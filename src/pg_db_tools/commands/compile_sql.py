@@ -56,9 +56,7 @@ def sql_command(args):
     renderer = SqlRenderer()
     renderer.if_not_exists = args.if_not_exists
 
-    rendered_chunks = renderer.render_chunks(data)
-
-    out_file.writelines(rendered_chunks)
+    renderer.render(out_file, data)
 
 
 def error_chain(e):
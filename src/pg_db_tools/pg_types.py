@@ -9,6 +9,7 @@ from operator import itemgetter
 import itertools
 import re
 import io
+import sys
 
 from pkg_resources import resource_stream
 import yaml
@@ -29,6 +30,10 @@ SKIPPED_SCHEMAS = [
     "dep_recurse",
 ]
 
+# Use the libyaml based loader when PyYAML was built with it, it produces the
+# same data as the pure Python SafeLoader, only much faster.
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class SchemaException(Exception):
     pass
@@ -285,13 +290,14 @@ class PgDatabase:
         )
 
     def get_type_ref(self, type_str: str):
-        if "." in type_str:
-            return PgTypeRef(
-                self.register_schema(type_str.split(".", 1)[0]),
-                type_str.split(".", 1)[1],
-            )
+        # The same few type names are referenced by most columns and return
+        # types, so they are interned to share one string object per name
+        schema_name, dot, name = type_str.partition(".")
+
+        if dot:
+            return PgTypeRef(self.register_schema(schema_name), sys.intern(name))
         else:
-            return PgTypeRef(self.register_schema(DEFAULT_SCHEMA), type_str)
+            return PgTypeRef(self.register_schema(DEFAULT_SCHEMA), sys.intern(type_str))
 
     def find_dependencies(self, text):
         dependencies = []
@@ -353,7 +359,7 @@ def validate_schema(data):
 
 
 def load(infile: io.IOBase) -> PgDatabase:
-    data = yaml.load(infile, Loader=yaml.SafeLoader)
+    data = yaml.load(infile, Loader=YAML_LOADER)
 
     validate_schema(data)
 
@@ -379,6 +385,10 @@ class PgObject:
     schema: "PgSchema"
     simpletypename_re = re.compile(r"[a-z][a-z0-9_\s]*(?:\[\])?$")
 
+    # Empty, so that subclasses can opt in to __slots__; the ones that don't
+    # still get an instance __dict__ as usual
+    __slots__ = ()
+
     def __init__(self):
         self.dependencies = []
         self.schema = None
@@ -418,6 +428,11 @@ class PgObject:
     def mapped_name(self):
         return data_type_mapping.get(self.name, self.name)
 
+    @property
+    def qualified_ident(self) -> str:
+        """Quoted, schema qualified identifier of the object."""
+        return '"{}"."{}"'.format(self.schema.name, self.name)
+
     @property
     def argument_number(self) -> int:
         try:
@@ -724,6 +739,17 @@ class PgColumn(PgObject):
     name: str
     data_type: str
 
+    # Databases have many more columns than other objects
+    __slots__ = (
+        "name",
+        "data_type",
+        "generated_identity",
+        "nullable",
+        "description",
+        "default",
+        "comment",
+    )
+
     def __init__(self, name: str, data_type: str):
         self.name = name
         self.data_type = data_type
@@ -736,6 +762,10 @@ class PgColumn(PgObject):
     def __str__(self) -> str:
         return "{} {}".format(self.name, self.data_type)
 
+    def comparable_key(self) -> tuple:
+        """Key that is equal for columns that are (very much) comparable."""
+        return self.name, self.data_type.ident(), self.nullable
+
     def to_json(self) -> OrderedDict:
         attributes = [
             ("name", self.name),
@@ -1123,14 +1153,16 @@ class PgTable(PgObject):
 
     def has_comparable_column(self, other_column):
         # do we have a column (very much) comparable to other_column?
-        for own_column in self.columns:
-            if (
-                own_column.name == other_column.name
-                and own_column.data_type.ident() == other_column.data_type.ident()
-                and own_column.nullable == other_column.nullable
-            ):
-                return True
-        return False
+        key = other_column.comparable_key()
+
+        return any(own_column.comparable_key() == key for own_column in self.columns)
+
+    def comparable_column_keys(self) -> set:
+        """
+        Return the comparable keys of all columns, for checking many columns
+        against this table without scanning all columns for each of them.
+        """
+        return {column.comparable_key() for column in self.columns}
 
     def diff(self, other_table) -> Diff:
         result = Diff()
@@ -2578,6 +2610,9 @@ class PgTableRef(PgObject):
     def has_comparable_column(self, other_column):
         return self.dereference().has_comparable_column(other_column)
 
+    def comparable_column_keys(self) -> set:
+        return self.dereference().comparable_column_keys()
+
 
 class PgType(PgObject):
     def __init__(self, schema, name):
@@ -2755,6 +2790,8 @@ class PgDescription(str):
 
 
 class PgArgument:
+    __slots__ = ("name", "data_type", "mode", "default")
+
     def __init__(self, name, data_type, mode, default):
         self.name = name
         self.data_type = data_type
@@ -2765,7 +2802,8 @@ class PgArgument:
     def from_json(data):
         return PgArgument(
             data.get("name"),
-            PgTypeRef(None, data["data_type"]),
+            # Interned like the type names in PgDatabase.get_type_ref
+            PgTypeRef(None, sys.intern(data["data_type"])),
             data.get("mode", "i"),
             data.get("default"),
         )
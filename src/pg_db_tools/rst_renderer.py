@@ -107,10 +107,7 @@ def render_enum(pg_enum):
     ).format(
         header(2, 'Enum ``{}``'.format(pg_enum.name)),
         '\n'.join(
-            render_table_grid(
-                ['Value'],
-                [(value, ) for value in pg_enum.values]
-            )
+            render_enum_grid([(value, ) for value in pg_enum.values])
         )
     )
 
@@ -197,8 +194,7 @@ def render_table(table):
             return column_description.strip()
 
     lines.extend(
-        render_table_grid(
-            ['Column', 'Type', 'Nullable', 'Description'],
+        render_column_grid(
             [
                 (
                     column.name,
@@ -216,8 +212,19 @@ def render_table(table):
     return ''.join('{}\n'.format(line) for line in lines)
 
 
-def render_table_grid(header, rows):
-    header_widths = list(map(len, header))
+def make_grid_renderer(header):
+    """
+    Return a grid renderer specialized for a fixed header.
+
+    Everything that only depends on the header (the minimal column widths and
+    the row format) is computed once here instead of for every rendered grid.
+
+    :param header: sequence of column names
+    :return: function that takes the rows and yields the lines of the grid
+    """
+    header = tuple(header)
+    header_widths = [len(column_name) for column_name in header]
+    row_fmt = '| {} |'.format(' | '.join(['{}'] * len(header)))
 
     def max_widths(widths, row):
         return [
@@ -225,37 +232,45 @@ def render_table_grid(header, rows):
             for width, cell_value in zip(widths, row)
         ]
 
-    max_widths = reduce(max_widths, rows, header_widths)
+    def render_grid(rows):
+        widths = reduce(max_widths, rows, header_widths)
 
-    sep_line = render_sep_line('-', max_widths)
-    header_sep_line = render_sep_line('=', max_widths)
+        sep_line = render_sep_line('-', widths)
 
-    yield sep_line
+        yield sep_line
 
-    yield '| {} |'.format(
-        ' | '.join(
-            column_name.ljust(width)
-            for column_name, width in zip(header, max_widths)
+        yield row_fmt.format(
+            *(
+                column_name.ljust(width)
+                for column_name, width in zip(header, widths)
+            )
         )
-    )
 
-    yield header_sep_line
+        yield render_sep_line('=', widths)
 
-    for line in iter_join(
+        yield from iter_join(
             sep_line,
             (
-                '| {} |'.format(
-                    ' | '.join(
+                row_fmt.format(
+                    *(
                         str(cell_value).ljust(width)
-                        for cell_value, width in zip(row, max_widths)
+                        for cell_value, width in zip(row, widths)
                     )
                 )
                 for row in rows
             )
-    ):
-        yield line
+        )
+
+        yield sep_line
+
+    return render_grid
+
+
+render_enum_grid = make_grid_renderer(('Value',))
 
-    yield sep_line
+render_column_grid = make_grid_renderer(
+    ('Column', 'Type', 'Nullable', 'Description')
+)
 
 
 def render_sep_line(sep_char, widths):
@@ -1,8 +1,8 @@
-from itertools import chain
-from typing import Generator, List
+from functools import lru_cache
+from operator import attrgetter
+from typing import List
 
 from pg_db_tools import iter_join
-from pg_db_tools.graph import database_to_graph
 from pg_db_tools.pg_types import (
     PgEnumType,
     PgTable,
@@ -26,6 +26,13 @@ from pg_db_tools.pg_types import (
 from pg_db_tools.modification import DropColumn, AddColumn
 
 
+# Identifiers, labels, descriptions and column definitions recur throughout a
+# database (schema names, column names), so quoting, escaping and column
+# definition results are cached. All of these caches are bounded by this size
+# to keep memory use in check for long running processes and large databases.
+RENDER_CACHE_SIZE = 8192
+
+
 def render_setting_sql(pg_setting) -> List[str]:
     return [
         "DO $$ BEGIN",
@@ -47,289 +54,306 @@ def render_query_sql(pg_query) -> List[str]:
         return ["{};".format(query)]
 
 
-def render_table_sql(table) -> Generator[str, None, None]:
-    options = []
+def render_table_sql(table) -> List[str]:
+    lines = []
     post_options = []
 
+    ident = table.qualified_ident
+
     if table.partition_type:
+        partition_columns = ",".join(table.partition_columns)
         post_options.append(
-            "PARTITION BY {} ({})".format(
-                table.partition_type.upper(), ",".join(table.partition_columns)
-            )
+            f"PARTITION BY {table.partition_type.upper()} ({partition_columns})"
         )
 
     if table.inherits:
-        post_options.append(
-            "INHERITS ({}.{})".format(
-                quote_ident(table.inherits.schema.name),
-                quote_ident(table.inherits.name),
-            )
-        )
+        post_options.append(f"INHERITS ({table.inherits.qualified_ident})")
 
-    yield (
-        "CREATE {persistence}TABLE {options}{ident}\n"
+    persistence = (
+        "" if table.persistence == "permanent" else table.persistence.upper() + " "
+    )
+    columns_part = render_components(table_defining_components(table))
+    post_options_part = " ".join(post_options)
+
+    lines.append(
+        f"CREATE {persistence}TABLE {ident}\n"
         "(\n"
-        "{columns_part}\n"
-        "){post_options};\n"
-    ).format(
-        persistence=(
-            "" if table.persistence == "permanent" else table.persistence.upper() + " "
-        ),
-        options="".join("{} ".format(option) for option in options),
-        ident="{}.{}".format(quote_ident(table.schema.name), quote_ident(table.name)),
-        columns_part=",\n".join(table_defining_components(table)),
-        post_options=" ".join(post_options),
+        f"{columns_part}\n"
+        f"){post_options_part};\n"
     )
 
     if table.description:
-        yield ("COMMENT ON TABLE {} IS {};\n").format(
-            "{}.{}".format(quote_ident(table.schema.name), quote_ident(table.name)),
-            quote_string(escape_string(table.description)),
-        )
+        description = quote_string(escape_string(table.description))
+        lines.append(f"COMMENT ON TABLE {ident} IS {description};\n")
 
     for column in table.columns:
         if column.description:
-            yield ("COMMENT ON COLUMN {}.{}.{} IS {};\n").format(
-                quote_ident(table.schema.name),
-                quote_ident(table.name),
-                quote_ident(column.name),
-                quote_string(escape_string(column.description)),
+            description = quote_string(escape_string(column.description))
+            lines.append(
+                f"COMMENT ON COLUMN {ident}.{quote_ident(column.name)} "
+                f"IS {description};\n"
             )
 
     if table.indexes:
         for index in table.indexes:
-            yield (
-                'CREATE{} INDEX "{}" ON {}.{} USING {};\n'.format(
-                    " UNIQUE" if index.unique else "",
-                    index.name,
-                    quote_ident(table.schema.name),
-                    quote_ident(table.name),
-                    index.definition,
-                )
+            unique = " UNIQUE" if index.unique else ""
+            lines.append(
+                f'CREATE{unique} INDEX "{index.name}" ON {ident} '
+                f"USING {index.definition};\n"
             )
 
     if table.owner:
-        yield (
-            "ALTER TABLE {}.{} OWNER TO {};\n".format(
-                quote_ident(table.schema.name),
-                quote_ident(table.name),
-                table.owner.name,
-            )
-        )
+        lines.append(f"ALTER TABLE {ident} OWNER TO {table.owner.name};\n")
 
     for role, grants in table.privileges:
-        yield (
-            "GRANT {} ON TABLE {}.{} TO {};\n".format(
-                grants, quote_ident(table.schema.name), quote_ident(table.name), role
-            )
-        )
+        lines.append(f"GRANT {grants} ON TABLE {ident} TO {role};\n")
 
     for query in table.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
 
 
 def render_drop_table_sql(table: PgTable) -> str:
-    return "DROP TABLE {}.{};".format(
-        quote_ident(table.schema.name), quote_ident(table.name)
-    )
+    return f"DROP TABLE {table.qualified_ident};"
+
 
+def table_defining_components(table: PgTable) -> List[str]:
+    components = []
+
+    if table.inherits:
+        inherited_columns = table.inherits.comparable_column_keys()
+    else:
+        inherited_columns = set()
 
-def table_defining_components(table: PgTable) -> Generator[str, None, None]:
     for column_data in table.columns:
-        if table.inherits and table.inherits.has_comparable_column(column_data):
+        if column_data.comparable_key() in inherited_columns:
             # We already have this from inheritance, so don't need to define
             continue
-        yield "  {}".format(render_column_definition(column_data))
+        components.append(render_column_definition(column_data))
 
     if table.primary_key:
-        yield "  PRIMARY KEY ({})".format(", ".join(table.primary_key.columns))
+        components.append(f"PRIMARY KEY ({', '.join(table.primary_key.columns)})")
 
     if table.unique:
         for unique_constraint in table.unique:
-            yield "  UNIQUE ({})".format(", ".join(unique_constraint["columns"]))
+            components.append(f"UNIQUE ({', '.join(unique_constraint['columns'])})")
 
     for check in table.checks:
         if check.name:
-            yield "  CONSTRAINT {} CHECK {}".format(
-                quote_ident(check.name), check.expression
+            components.append(
+                f"CONSTRAINT {quote_ident(check.name)} CHECK {check.expression}"
             )
         else:
-            yield "  CHECK {}".format(check.expression)
+            components.append(f"CHECK {check.expression}")
 
     if table.exclude:
         for exclude_constraint in table.exclude:
-            yield "  {}".format(render_exclude_constraint(exclude_constraint))
+            components.append(render_exclude_constraint(exclude_constraint))
+
+    return components
+
+
+def render_components(components: List[str]) -> str:
+    """
+    Render the indented, comma separated body of a CREATE statement.
+
+    The indentation is part of the separator, so the components themselves
+    don't need to be prefixed.
+    """
+    if not components:
+        return ""
+
+    return "  " + ",\n  ".join(components)
 
 
 def render_column_definition(column: PgColumn) -> str:
-    parts = [quote_ident(column.name), str(column.data_type)]
+    return _render_column_definition(
+        column.name,
+        str(column.data_type),
+        column.nullable,
+        column.default,
+        column.generated_identity,
+    )
+
 
-    if column.nullable is False:
+# Keyed on the values that make up the definition rather than on the column
+# object, so that changes to a column are never masked by a stale result and
+# identical columns in different tables share one entry. Typed, because the
+# nullable check distinguishes False from other falsy values.
+@lru_cache(maxsize=RENDER_CACHE_SIZE, typed=True)
+def _render_column_definition(
+    name, data_type, nullable, default, generated_identity
+) -> str:
+    parts = [quote_ident(name), data_type]
+
+    if nullable is False:
         parts.append("NOT NULL")
 
-    if column.default:
-        parts.append("DEFAULT {}".format(column.default))
+    if default:
+        parts.append(f"DEFAULT {default}")
 
-    if column.generated_identity is not None:
-        if column.generated_identity == "by_default":
+    if generated_identity is not None:
+        if generated_identity == "by_default":
             parts.append("GENERATED BY DEFAULT AS IDENTITY")
-        elif column.generated_identity == "always":
+        elif generated_identity == "always":
             parts.append("GENERATED ALWAYS AS IDENTITY")
 
     return " ".join(parts)
 
 
 def render_composite_type_column_definition(column: PgColumn) -> str:
-    return "{} {}".format(quote_ident(column.name), column.data_type)
+    return f"{quote_ident(column.name)} {column.data_type}"
 
 
 def render_exclude_constraint(exclude_data) -> str:
-    parts = ["EXCLUDE "]
+    index_method = exclude_data.get("index_method")
+    using_part = f"USING {index_method} " if index_method else ""
+    exclusions = ", ".join(
+        f"{e['exclude_element']} WITH {e['operator']}"
+        for e in exclude_data["exclusions"]
+    )
 
-    if exclude_data.get("index_method"):
-        parts.append("USING {index_method} ".format(**exclude_data))
+    return f"EXCLUDE {using_part}({exclusions})"
 
-    parts.append(
-        "({})".format(
-            ", ".join(
-                "{exclude_element} WITH {operator}".format(**e)
-                for e in exclude_data["exclusions"]
-            )
-        )
-    )
 
-    return "".join(parts)
+# Argument modes that are part of a function signature: in, out, inout and
+# variadic. Table ('t') arguments end up in the RETURNS TABLE clause instead.
+SIGNATURE_ARGUMENT_MODES = frozenset("iobv")
 
 
-def render_function_sql(
-    pg_function: PgFunction, replace=False
-) -> Generator[str, None, None]:
-    returns_part = "    RETURNS "
+def render_function_sql(pg_function: PgFunction, replace=False) -> List[str]:
+    lines = []
 
-    table_arguments = [
-        argument for argument in pg_function.arguments if argument.mode == "t"
-    ]
+    arguments = []
+    table_arguments = []
+
+    for argument in pg_function.arguments:
+        if argument.mode == "t":
+            table_arguments.append(render_argument(argument))
+        elif argument.mode in SIGNATURE_ARGUMENT_MODES:
+            arguments.append(render_argument(argument))
+
+    arguments_part = ", ".join(arguments)
 
     if table_arguments:
-        returns_part += "TABLE({})".format(
-            ", ".join(render_argument(argument) for argument in table_arguments)
-        )
+        returns = "TABLE({})".format(", ".join(table_arguments))
     else:
-        if pg_function.returns_set:
-            returns_part += "SETOF "
-
-        returns_part += pg_function.return_type.ident()
+        setof = "SETOF " if pg_function.returns_set else ""
+        returns = f"{setof}{pg_function.return_type.ident()}"
 
     if replace:
         create_part = "CREATE OR REPLACE FUNCTION"
     else:
         create_part = "CREATE FUNCTION"
 
-    yield (
-        '{} "{}"."{}"({})'.format(
-            create_part,
-            pg_function.schema.name,
-            pg_function.name,
-            ", ".join(
-                render_argument(argument)
-                for argument in pg_function.arguments
-                if argument.mode in ("i", "o", "b", "v")
-            ),
+    lines.append(f"{create_part} {pg_function.qualified_ident}({arguments_part})")
+    lines.append(f"    RETURNS {returns}")
+    src = str(pg_function.src)
+    tag = "function" if "$$" in src else ""
+
+    lines.append(f"AS ${tag}$")
+    lines.append(src)
+    lines.append(
+        "${}$ LANGUAGE {} {}{}{};".format(
+            tag,
+            pg_function.language,
+            pg_function.volatility.upper(),
+            " STRICT" if pg_function.strict else "",
+            " SECURITY DEFINER" if pg_function.secdef else "",
         )
     )
-    yield returns_part
-    yield "AS $function$" if "$$" in str(pg_function.src) else "AS $$"
-    yield str(pg_function.src)
-    yield "${}$ LANGUAGE {} {}{}{};".format(
-        "function" if "$$" in str(pg_function.src) else "",
-        pg_function.language,
-        pg_function.volatility.upper(),
-        " STRICT" if pg_function.strict else "",
-        " SECURITY DEFINER" if pg_function.secdef else "",
-    )
 
     if pg_function.description:
-        yield '\nCOMMENT ON FUNCTION "{}"."{}"({}) IS {};'.format(
-            pg_function.schema.name,
-            pg_function.name,
-            ", ".join(
-                render_argument(argument)
-                for argument in pg_function.arguments
-                if argument.mode in ("i", "o", "b", "v")
-            ),
-            quote_string(escape_string(pg_function.description)),
+        lines.append(
+            "\nCOMMENT ON FUNCTION {}({}) IS {};".format(
+                pg_function.qualified_ident,
+                arguments_part,
+                quote_string(escape_string(pg_function.description)),
+            )
         )
 
     for query in pg_function.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
 
 
-def render_procedure_sql(
-    pg_procedure: PgProcedure, replace=False
-) -> Generator[str, None, None]:
+def render_procedure_sql(pg_procedure: PgProcedure, replace=False) -> List[str]:
+    lines = []
+
     if replace:
         create_part = "CREATE OR REPLACE PROCEDURE"
     else:
         create_part = "CREATE PROCEDURE"
 
-    yield (
-        '{} "{}"."{}"({})'.format(
-            create_part,
-            pg_procedure.schema.name,
-            pg_procedure.name,
-            ", ".join(render_argument(argument) for argument in pg_procedure.arguments),
-        )
-    )
-    yield "AS $procedure$" if "$$" in str(pg_procedure.src) else "AS $$"
-    yield str(pg_procedure.src)
-    yield "${}$ LANGUAGE {};".format(
-        "procedure" if "$$" in str(pg_procedure.src) else "", pg_procedure.language
+    arguments_part = ", ".join(
+        render_argument(argument) for argument in pg_procedure.arguments
     )
 
+    lines.append(f"{create_part} {pg_procedure.qualified_ident}({arguments_part})")
+    src = str(pg_procedure.src)
+    tag = "procedure" if "$$" in src else ""
+
+    lines.append(f"AS ${tag}$")
+    lines.append(src)
+    lines.append(f"${tag}$ LANGUAGE {pg_procedure.language};")
+
     if pg_procedure.description:
-        yield '\nCOMMENT ON FUNCTION "{}"."{}"({}) IS {};'.format(
-            pg_procedure.schema.name,
-            pg_procedure.name,
-            ", ".join(render_argument(argument) for argument in pg_procedure.arguments),
-            quote_string(escape_string(pg_procedure.description)),
+        lines.append(
+            "\nCOMMENT ON FUNCTION {}({}) IS {};".format(
+                pg_procedure.qualified_ident,
+                arguments_part,
+                quote_string(escape_string(pg_procedure.description)),
+            )
         )
 
     for query in pg_procedure.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
+
+
+def render_argument_types(arguments: List[PgArgument]) -> str:
+    return ", ".join(argument.data_type.ident() for argument in arguments)
 
 
 def render_drop_function_sql(pg_function: PgFunction) -> str:
-    args_part = ", ".join(
-        str(argument.data_type.ident())
-        for argument in pg_function.arguments
-        if argument.mode in ("i", "o", "b", "v")
+    args_part = render_argument_types(
+        [
+            argument
+            for argument in pg_function.arguments
+            if argument.mode in SIGNATURE_ARGUMENT_MODES
+        ]
     )
 
-    return 'DROP FUNCTION "{}"."{}"({});'.format(
-        pg_function.schema.name, pg_function.name, args_part
-    )
+    return f"DROP FUNCTION {pg_function.qualified_ident}({args_part});"
 
 
 def render_drop_procedure_sql(pg_procedure: PgProcedure) -> str:
-    args_part = ", ".join(
-        str(argument.data_type.ident()) for argument in pg_procedure.arguments
-    )
+    args_part = render_argument_types(pg_procedure.arguments)
 
-    return 'DROP PROCEDURE "{}"."{}"({});'.format(
-        pg_procedure.schema.name, pg_procedure.name, args_part
-    )
+    return f"DROP PROCEDURE {pg_procedure.qualified_ident}({args_part});"
+
+
+trigger_when_sql = {"before": "BEFORE", "after": "AFTER", "instead": "INSTEAD OF"}
+
+trigger_event_sql = {
+    "insert": "INSERT",
+    "update": "UPDATE",
+    "delete": "DELETE",
+    "truncate": "TRUNCATE",
+}
 
 
 def render_trigger_sql(pg_trigger: PgTrigger) -> List[str]:
-    when = "INSTEAD OF" if pg_trigger.when == "instead" else pg_trigger.when.upper()
+    when = trigger_when_sql.get(pg_trigger.when) or pg_trigger.when.upper()
+    events = " OR ".join(
+        trigger_event_sql.get(event) or event.upper() for event in pg_trigger.events
+    )
     return [
         "CREATE TRIGGER {}".format(pg_trigger.name),
-        "  {} {} ON {}".format(
-            when, " OR ".join(pg_trigger.events).upper(), pg_trigger.table
-        ),
+        "  {} {} ON {}".format(when, events, pg_trigger.table),
         "  FOR EACH {}".format(pg_trigger.affecteach.upper()),
         "  EXECUTE PROCEDURE {}();".format(pg_trigger.function),
     ]
@@ -341,15 +365,15 @@ def render_drop_trigger_sql(pg_trigger: PgTrigger) -> str:
 
 def render_sequence_sql(pg_sequence: PgSequence) -> List[str]:
     return [
-        "CREATE SEQUENCE {}.{}".format(pg_sequence.schema.name, pg_sequence.name),
-        "  START WITH {}".format(pg_sequence.start_value),
-        "  INCREMENT BY {}".format(pg_sequence.increment),
+        f"CREATE SEQUENCE {pg_sequence.schema.name}.{pg_sequence.name}",
+        f"  START WITH {pg_sequence.start_value}",
+        f"  INCREMENT BY {pg_sequence.increment}",
         "  NO MINVALUE"
         if pg_sequence.minimum_value is None
-        else "MINVALUE {}".format(pg_sequence.minimum_value),
+        else f"MINVALUE {pg_sequence.minimum_value}",
         "  NO MAXVALUE"
         if pg_sequence.maximum_value is None
-        else "MAXVALUE {}".format(pg_sequence.maximum_value),
+        else f"MAXVALUE {pg_sequence.maximum_value}",
         "  CACHE 1;",
     ]
 
@@ -391,16 +415,20 @@ def render_row_sql(pg_row) -> List[str]:
         "INSERT INTO {} ({}) VALUES ({});".format(  # nosec B608
             pg_row.table,
             ", ".join(pg_row.values.keys()),
-            ", ".join(
-                [
-                    "'{}'".format(x) if x == str(x) else "null" if x is None else str(x)
-                    for x in pg_row.values.values()
-                ]
-            ),
+            ", ".join(render_row_value(value) for value in pg_row.values.values()),
         )
     ]
 
 
+def render_row_value(value) -> str:
+    if value is None:
+        return "null"
+    elif isinstance(value, str):
+        return quote_string(escape_string(value))
+    else:
+        return str(value)
+
+
 def render_role_sql(pg_role: PgRole) -> List[str]:
     attributes = (["LOGIN"] if pg_role.login else []) + [
         "SUPERUSER" if pg_role.super else "NOSUPERUSER",
@@ -408,155 +436,140 @@ def render_role_sql(pg_role: PgRole) -> List[str]:
         "CREATEDB" if pg_role.createdb else "NOCREATEDB",
         "CREATEROLE;" if pg_role.createrole else "NOCREATEROLE;",
     ]
-    return (
-        [
-            "DO\n$$\nBEGIN",
-            "  IF NOT EXISTS(SELECT * FROM pg_roles "  # nosec B608
-            "WHERE rolname = '{}') THEN".format(pg_role.name),  # nosec B608
-            "    CREATE ROLE {}".format(pg_role.name),
-            "      " + " ".join(attribute for attribute in attributes),
-            "  END IF;\nEND\n$$;",
-        ]
-        + [
-            "\nGRANT {} TO {};".format(membership.name, pg_role.name)
-            for membership in pg_role.membership
-        ]
-        + (
-            ["\nCOMMENT ON ROLE {} IS '{}';".format(pg_role.name, pg_role.description)]
-            if pg_role.description is not None
-            else []
-        )
+    result = [
+        "DO\n$$\nBEGIN",
+        "  IF NOT EXISTS(SELECT * FROM pg_roles "  # nosec B608
+        f"WHERE rolname = '{pg_role.name}') THEN",  # nosec B608
+        f"    CREATE ROLE {pg_role.name}",
+        "      {}".format(" ".join(attributes)),
+        "  END IF;\nEND\n$$;",
+    ]
+
+    result.extend(
+        f"\nGRANT {membership.name} TO {pg_role.name};"
+        for membership in pg_role.membership
     )
 
+    if pg_role.description is not None:
+        result.append(f"\nCOMMENT ON ROLE {pg_role.name} IS '{pg_role.description}';")
 
-def render_view_sql(pg_view: PgView) -> Generator[str, None, None]:
-    yield 'CREATE VIEW "{}"."{}" AS'.format(pg_view.schema.name, pg_view.name)
-    yield pg_view.view_query
-
-    grantees = {privilege[0] for privilege in pg_view.privileges}
-
-    for grantee in grantees:
-        yield "\nGRANT {} ON TABLE {}.{} TO {};".format(
-            ",".join(
-                [
-                    privilege[1]
-                    for privilege in pg_view.privileges
-                    if privilege[0] == grantee
-                ]
-            ),
-            quote_ident(pg_view.schema.name),
-            quote_ident(pg_view.name),
-            grantee,
-        )
+    return result
+
+
+def render_view_sql(pg_view: PgView) -> List[str]:
+    lines = []
+
+    ident = pg_view.qualified_ident
+
+    lines.append(f"CREATE VIEW {ident} AS")
+    lines.append(pg_view.view_query)
+
+    # Group the privileges per grantee, in order of first appearance
+    grantee_privileges = {}
+
+    for grantee, privilege in pg_view.privileges:
+        grantee_privileges.setdefault(grantee, []).append(privilege)
+
+    for grantee, privileges in grantee_privileges.items():
+        lines.append(f"\nGRANT {','.join(privileges)} ON TABLE {ident} TO {grantee};")
 
     for query in pg_view.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
 
 
 def render_drop_view_sql(pg_view: PgView) -> str:
-    return 'DROP VIEW "{}"."{}"'.format(pg_view.schema.name, pg_view.name)
-
-
-def render_composite_type_sql(
-    pg_composite_type: PgCompositeType,
-) -> Generator[str, None, None]:
-    yield ("CREATE TYPE {ident} AS (\n" "{columns_part}\n" ");\n").format(
-        ident="{}.{}".format(
-            quote_ident(pg_composite_type.schema.name),
-            quote_ident(pg_composite_type.name),
-        ),
-        columns_part=",\n".join(
-            "  {}".format(render_composite_type_column_definition(column_data))
+    return f"DROP VIEW {pg_view.qualified_ident}"
+
+
+def render_composite_type_sql(pg_composite_type: PgCompositeType) -> List[str]:
+    ident = pg_composite_type.qualified_ident
+    columns_part = render_components(
+        [
+            render_composite_type_column_definition(column_data)
             for column_data in pg_composite_type.columns
-        ),
+        ]
     )
 
+    return [f"CREATE TYPE {ident} AS (\n{columns_part}\n);\n"]
+
 
 def render_drop_composite_type_sql(pg_composite_type: PgCompositeType) -> str:
-    return "DROP TYPE {ident};".format(
-        ident="{}.{}".format(
-            quote_ident(pg_composite_type.schema.name),
-            quote_ident(pg_composite_type.name),
-        )
-    )
+    return f"DROP TYPE {pg_composite_type.qualified_ident};"
 
 
-def render_enum_type_sql(pg_enum_type: PgEnumType) -> Generator[str, None, None]:
-    yield ("CREATE TYPE {ident} AS ENUM (\n" "{labels_part}\n" ");\n").format(
-        ident="{}.{}".format(
-            quote_ident(pg_enum_type.schema.name), quote_ident(pg_enum_type.name)
-        ),
-        labels_part=",\n".join(
-            "  {}".format(quote_string(label)) for label in pg_enum_type.labels
-        ),
+def render_enum_type_sql(pg_enum_type: PgEnumType) -> List[str]:
+    ident = pg_enum_type.qualified_ident
+    labels_part = render_components(
+        [quote_string(label) for label in pg_enum_type.labels]
     )
 
+    return [f"CREATE TYPE {ident} AS ENUM (\n{labels_part}\n);\n"]
 
-def render_aggregate_sql(pg_aggregate: PgAggregate) -> Generator[str, None, None]:
-    properties = [
-        "    sfunc = {}".format(pg_aggregate.sfunc.ident()),
-        "    stype = {}".format(pg_aggregate.stype.ident()),
-    ]
 
-    yield ("CREATE AGGREGATE {ident} ({arguments}) (\n" "{properties}\n" ");\n").format(
-        ident=pg_aggregate.ident(),
-        arguments=", ".join(
-            render_argument(argument) for argument in pg_aggregate.arguments
-        ),
-        properties=",\n".join(properties),
+def render_aggregate_sql(pg_aggregate: PgAggregate) -> List[str]:
+    lines = []
+
+    properties_part = (
+        f"    sfunc = {pg_aggregate.sfunc.ident()},\n"
+        f"    stype = {pg_aggregate.stype.ident()}"
+    )
+    arguments = ", ".join(
+        render_argument(argument) for argument in pg_aggregate.arguments
+    )
+
+    lines.append(
+        f"CREATE AGGREGATE {pg_aggregate.ident()} ({arguments}) (\n"
+        f"{properties_part}\n"
+        ");\n"
     )
 
     for query in pg_aggregate.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
 
 
 def render_argument(pg_argument: PgArgument) -> str:
     if pg_argument.name is None:
         return str(pg_argument.data_type.ident())
     else:
-        return "{} {}{}".format(
-            quote_ident(pg_argument.name),
-            pg_argument.data_type.ident(),
-            ""
-            if pg_argument.default is None
-            else " DEFAULT {}".format(pg_argument.default),
+        if pg_argument.default is None:
+            default_part = ""
+        else:
+            default_part = f" DEFAULT {pg_argument.default}"
+
+        return (
+            f"{quote_ident(pg_argument.name)} {pg_argument.data_type.ident()}"
+            f"{default_part}"
         )
 
 
-def render_schema_sql(pg_schema: PgSchema) -> Generator[str, None, None]:
-    yield ("CREATE SCHEMA IF NOT EXISTS {ident};").format(
-        ident=quote_ident(pg_schema.name)
-    )
+def render_schema_sql(pg_schema: PgSchema) -> List[str]:
+    lines = []
+
+    ident = quote_ident(pg_schema.name)
+
+    lines.append(f"CREATE SCHEMA IF NOT EXISTS {ident};")
     if pg_schema.comment:
-        yield (
-            "COMMENT ON SCHEMA {} IS {};".format(
-                quote_ident(pg_schema.name),
-                quote_string(escape_string(pg_schema.comment)),
-            )
-        )
+        comment = quote_string(escape_string(pg_schema.comment))
+        lines.append(f"COMMENT ON SCHEMA {ident} IS {comment};")
     if pg_schema.owner:
-        yield (
-            "ALTER SCHEMA {} OWNER TO {};".format(
-                quote_ident(pg_schema.name), pg_schema.owner.name
-            )
+        lines.append(f"ALTER SCHEMA {ident} OWNER TO {pg_schema.owner.name};")
+    for role, privilege in pg_schema.privileges:
+        lines.append(
+            f"GRANT {privilege} ON SCHEMA {ident} TO {quote_ident(role.name)};"
         )
-    for priv in pg_schema.privileges:
-        yield (
-            "GRANT {} ON SCHEMA {} TO {};".format(
-                priv[1], quote_ident(pg_schema.name), quote_ident(priv[0].name)
-            )
-        )
-    for priv in pg_schema.default_privileges:
-        yield (
-            "ALTER DEFAULT PRIVILEGES IN SCHEMA {} GRANT {} ON {} TO {};\n".format(
-                quote_ident(pg_schema.name), priv[2], priv[1], quote_ident(priv[0].name)
-            )
+    for role, objclass, privilege in pg_schema.default_privileges:
+        lines.append(
+            f"ALTER DEFAULT PRIVILEGES IN SCHEMA {ident} "
+            f"GRANT {privilege} ON {objclass} TO {quote_ident(role.name)};\n"
         )
     for query in pg_schema.queries:
-        for line in render_query_sql(query):
-            yield line
+        lines.extend(render_query_sql(query))
+
+    return lines
 
 sql_renderers = {
     PgSetting: render_setting_sql,
@@ -579,18 +592,16 @@ sql_renderers = {
 
 
 def render_drop_column(drop_column: DropColumn) -> str:
-    return "ALTER TABLE {}.{} DROP COLUMN {};".format(
-        quote_ident(drop_column.table.schema.name),
-        quote_ident(drop_column.table.name),
-        quote_ident(drop_column.column.name),
+    return (
+        f"ALTER TABLE {drop_column.table.qualified_ident} "
+        f"DROP COLUMN {quote_ident(drop_column.column.name)};"
     )
 
 
 def render_add_column(add_column: AddColumn) -> str:
-    return "ALTER TABLE {}.{} ADD COLUMN {};".format(
-        quote_ident(add_column.table.schema.name),
-        quote_ident(add_column.table.name),
-        render_column_definition(add_column.column),
+    return (
+        f"ALTER TABLE {add_column.table.qualified_ident} "
+        f"ADD COLUMN {render_column_definition(add_column.column)};"
     )
 
 
@@ -608,81 +619,94 @@ class SqlRenderer:
         self.if_not_exists = True
 
     def render(self, out_file, database):
+        fragments = self.render_fragments(database)
 
-        graph = database_to_graph(database)
-
-        rendered_chunks = self.render_chunks(database)
-
-        out_file.writelines(rendered_chunks)
+        # Write the output in one call instead of one call per fragment
+        out_file.write("\n".join(fragments))
 
     def render_chunks(self, database):
-        return iter_join("\n", chain(*self.render_chunk_sets(database)))
-
-    def render_chunk_sets(self, database):
-        yield self.create_extension_statements(database)
+        """
+        Return the SQL for the database as chunks that can be written out as
+        they are, newline separators included.
+        """
+        return iter_join("\n", self.render_fragments(database))
+
+    def render_fragments(self, database) -> List[str]:
+        """
+        Return the SQL fragments for the database, to be joined by newlines.
+        """
+        chunks = list(self.create_extension_statements(database))
+
+        # Bound once, these loops run for every object in the database
+        extend = chunks.extend
+        renderers = sql_renderers
+        render_foreign_key = SqlRenderer.render_foreign_key
 
         for pg_object in database.objects:
-            yield "\n"
-            yield sql_renderers[type(pg_object)](pg_object)
+            chunks.append("\n")
+            extend(renderers[type(pg_object)](pg_object))
 
-        yield "\n"
+        chunks.append("\n")
 
-        for schema in sorted(database.schemas.values(), key=lambda s: s.name):
+        for schema in sorted(database.schemas.values(), key=attrgetter("name")):
             for table in schema.tables:
                 for index, foreign_key in enumerate(table.foreign_keys):
-                    yield SqlRenderer.render_foreign_key(
-                        index, schema, table, foreign_key
-                    )
+                    extend(render_foreign_key(index, schema, table, foreign_key))
+
+        return chunks
 
     @staticmethod
     def render_foreign_key(index, schema, table, foreign_key):
-        key_name = foreign_key.name or "{}_{}_fk_{}".format(
-            schema.name, table.name, index
+        key_name = foreign_key.name or f"{schema.name}_{table.name}_fk_{index}"
+
+        ident = table.qualified_ident
+        ref_ident = (
+            f"{quote_ident(foreign_key.get_name(foreign_key.schema))}."
+            f"{quote_ident(foreign_key.get_name(foreign_key.ref_table))}"
+        )
+        columns = ", ".join(foreign_key.columns)
+        ref_columns = ", ".join(foreign_key.ref_columns)
+        on_update = (
+            f" ON UPDATE {foreign_key.on_update.upper()}"
+            if foreign_key.on_update
+            else ""
         )
+        on_delete = (
+            f" ON DELETE {foreign_key.on_delete.upper()}"
+            if foreign_key.on_delete
+            else ""
+        )
+
         return [
-            (
-                "ALTER TABLE {schema_name}.{table_name}\n"
-                "  ADD CONSTRAINT {key_name}\n"
-                "  FOREIGN KEY ({columns})\n"
-                "  REFERENCES {ref_schema_name}.{ref_table_name} "
-                "({ref_columns}){on_update}{on_delete};\n"
-            ).format(
-                schema_name=quote_ident(schema.name),
-                table_name=quote_ident(table.name),
-                key_name=quote_ident(key_name),
-                columns=", ".join(foreign_key.columns),
-                ref_schema_name=quote_ident(foreign_key.get_name(foreign_key.schema)),
-                ref_table_name=quote_ident(foreign_key.get_name(foreign_key.ref_table)),
-                ref_columns=", ".join(foreign_key.ref_columns),
-                on_update=" ON UPDATE {}".format(foreign_key.on_update.upper())
-                if foreign_key.on_update
-                else "",
-                on_delete=" ON DELETE {}".format(foreign_key.on_delete.upper())
-                if foreign_key.on_delete
-                else "",
-            )
+            f"ALTER TABLE {ident}\n"
+            f"  ADD CONSTRAINT {quote_ident(key_name)}\n"
+            f"  FOREIGN KEY ({columns})\n"
+            f"  REFERENCES {ref_ident} ({ref_columns}){on_update}{on_delete};\n"
         ]
 
     def create_extension_statements(self, database):
-        options = []
-        
-        if self.if_not_exists:
-            options.append("IF NOT EXISTS")
+        # if_not_exists can be changed after construction, so the prefix is
+        # determined per call, but only once for all extensions
+        options = "IF NOT EXISTS " if self.if_not_exists else ""
 
         for extension_name in database.extensions:
-            yield "CREATE EXTENSION {options}{extension_name};\n".format(
-                options="".join("{} ".format(option) for option in options),
-                extension_name=extension_name,
-            )
+            yield f"CREATE EXTENSION {options}{extension_name};\n"
 
 
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
 def quote_ident(ident) -> str:
     return '"' + ident + '"'
 
 
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
 def quote_string(string) -> str:
     return "'" + string + "'"
 
 
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
 def escape_string(string) -> str:
+    if "'" not in string:
+        # Most strings contain no quotes, so avoid creating a copy
+        return string
+
     return string.replace("'", "''")
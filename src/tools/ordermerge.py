@@ -23,17 +23,20 @@ def main(source, ordersource):
         ((obj.schema.name, obj.name, extended_type(obj)), obj) for obj in source.objects
     )
     for object in ordersource.objects:
-        if (object.schema.name, object.name, extended_type(object)) in objectdict:
-            result.objects.append(
-                objectdict[(object.schema.name, object.name, extended_type(object))]
-            )
+        found = objectdict.get((object.schema.name, object.name, extended_type(object)))
+        if found is not None:
+            result.objects.append(found)
+    included = {id(object) for object in result.objects}
     for object in objectdict.values():
-        if object not in result.objects:
+        if id(object) not in included:
             result.objects.append(object)
+            included.add(id(object))
     return format_yaml(result.to_json(internal_order=True))
 
 
 if __name__ == "__main__":
-    source = load(open(sys.argv[1]).read())
-    ordersource = load(open(sys.argv[2]).read())
+    with open(sys.argv[1]) as source_file:
+        source = load(source_file)
+    with open(sys.argv[2]) as ordersource_file:
+        ordersource = load(ordersource_file)
     main(source, ordersource)
@@ -74,8 +74,6 @@ class TestDotRenderer(unittest.TestCase):
         renderer = DotRenderer()
         renderer.render(out, database)
 
-        out.seek(0)
-
-        rendered_dot = out.read()
+        rendered_dot = out.getvalue()
 
         self.assertTrue(len(rendered_dot) > 0)
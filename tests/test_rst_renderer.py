@@ -73,8 +73,6 @@ class TestRstRenderer(unittest.TestCase):
 
         render_rst_file(out, database)
 
-        out.seek(0)
-
-        rendered_rst = out.read()
+        rendered_rst = out.getvalue()
 
         self.assertTrue(len(rendered_rst) > 0)
@@ -4,8 +4,10 @@ Test the SQL rendering function for schema data.
 import unittest
 from io import StringIO
 
-from pg_db_tools.pg_types import load
-from pg_db_tools.sql_renderer import SqlRenderer
+import yaml
+
+from pg_db_tools.pg_types import load, PgDatabase, PgView, PgViewQuery
+from pg_db_tools.sql_renderer import SqlRenderer, render_row_value, render_view_sql
 
 
 json_data = """
@@ -80,10 +82,51 @@ class TestSqlRenderer(unittest.TestCase):
 
         renderer.render(out, database)
 
-        out.seek(0)
-
-        rendered_sql = out.read()
+        rendered_sql = out.getvalue()
 
         self.assertTrue('"created" timestamp with time zone NOT NULL DEFAULT now()' in rendered_sql)
 
         self.assertTrue(len(rendered_sql) > 0)
+
+    def test_render_chunks(self):
+        # Loaded without validation, the fixture above uses 'check'
+        database = PgDatabase.load(yaml.safe_load(json_data))
+
+        renderer = SqlRenderer()
+
+        out = StringIO()
+        renderer.render(out, database)
+
+        chunks_out = StringIO()
+        chunks_out.writelines(renderer.render_chunks(database))
+
+        self.assertEqual(chunks_out.getvalue(), out.getvalue())
+
+    def test_render_row_value(self):
+        self.assertEqual(render_row_value(None), 'null')
+
+        self.assertEqual(render_row_value(42), '42')
+
+        self.assertEqual(render_row_value("it's"), "'it''s'")
+
+    def test_render_view_grants(self):
+        schema = PgDatabase().register_schema("shop")
+        pg_view = PgView(schema, "order_view", PgViewQuery("SELECT 1;"))
+        pg_view.privileges = [
+            ("reader", "SELECT"),
+            ("writer", "INSERT"),
+            ("reader", "REFERENCES"),
+            ("admin", "SELECT"),
+            ("writer", "UPDATE"),
+        ]
+
+        rendered_sql = render_view_sql(pg_view)
+
+        self.assertEqual(
+            rendered_sql[2:],
+            [
+                '\nGRANT SELECT,REFERENCES ON TABLE "shop"."order_view" TO reader;',
+                '\nGRANT INSERT,UPDATE ON TABLE "shop"."order_view" TO writer;',
+                '\nGRANT SELECT ON TABLE "shop"."order_view" TO admin;',
+            ]
+        )